@@ -0,0 +1,43 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True, language_level=3
+
+# Compiled FCFS kernels for sim_core.py.
+# Build in place with:  cythonize -i _lindley.pyx
+# Without the built extension the numba kernels in sim_core.py are used instead.
+
+
+# ---------- Lindley recursion (M/M/1) ----------
+cdef void _lindley_mm1(double[::1] arrival, double[::1] service, double[::1] start) noexcept nogil:
+    cdef Py_ssize_t i
+    cdef double prev = 0.0
+    cdef double start_i
+    for i in range(arrival.shape[0]):
+        start_i = arrival[i] if arrival[i] > prev else prev
+        prev = start_i + service[i]
+        start[i] = start_i
+
+
+def lindley_mm1(double[::1] arrival, double[::1] service, double[::1] start):
+    with nogil:
+        _lindley_mm1(arrival, service, start)
+
+
+# ---------- FCFS server assignment (M/M/c) ----------
+cdef void _mmc_schedule(double[::1] arrival, double[::1] service, double[::1] free_at,
+                        double[::1] start) noexcept nogil:
+    cdef Py_ssize_t i, j, k
+    cdef Py_ssize_t c = free_at.shape[0]
+    cdef double start_i
+    for i in range(arrival.shape[0]):
+        # linear scan for the server that frees up first (c is tiny)
+        j = 0
+        for k in range(1, c):
+            if free_at[k] < free_at[j]:
+                j = k
+        start_i = arrival[i] if arrival[i] > free_at[j] else free_at[j]
+        free_at[j] = start_i + service[i]
+        start[i] = start_i
+
+
+def mmc_schedule(double[::1] arrival, double[::1] service, double[::1] free_at, double[::1] start):
+    with nogil:
+        _mmc_schedule(arrival, service, free_at, start)
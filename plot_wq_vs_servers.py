@@ -1,11 +1,10 @@
 import matplotlib.pyplot as plt
+import numpy as np
 
-Wq_mean_c1 = 2092.285117
-Wq_mean_c2 = 4.811421
-Wq_mean_c3 = 0.299868
-
-cs = [1, 2, 3]
-Wqs = [Wq_mean_c1, Wq_mean_c2, Wq_mean_c3]
+# averages written by question_2.py (run it first to refresh them)
+d = np.load("results.npz")
+cs = [int(c) for c in d["c"]]
+Wqs = [float(w) for w in d["Wq"]]
 
 plt.figure(figsize=(8, 5))
 plt.plot(cs, Wqs, marker="o", linewidth=2, markersize=8, color="steelblue")
@@ -16,7 +15,7 @@ for x, y in zip(cs, Wqs):
                  xytext=(0, 12), ha="center", fontsize=10)
 
 plt.yscale("log")  # log scale so all values are visible
-plt.xticks(cs, ["c=1", "c=2", "c=3"])
+plt.xticks(cs, [f"c={c}" for c in cs])
 plt.xlabel("Number of servers (c)", fontsize=12)
 plt.ylabel("Average waiting time in queue, Wq (log scale)", fontsize=12)
 plt.title("Wq vs Number of Servers (M/M/c Queue Simulation)", fontsize=13)
@@ -1,7 +1,11 @@
+import contextlib
+import io
 import math
+import sys
+
 import numpy as np
-import simpy
-from scipy.stats import expon, t
+
+from sim_core import simulate_mmc
 
 
 # ---------- Theory (lecturer formulas) ----------
@@ -17,145 +21,84 @@ def mm1_theory(lmbda, mu):
 
 
 # ---------- Helpers for mean + 95% CI ----------
+# t quantiles t_{0.975, df}, so the usual replication counts skip importing scipy
+_T_PPF_95 = {
+    1: 12.706204736174694,
+    2: 4.302652729749462,
+    3: 3.1824463052837078,
+    4: 2.7764451051977934,
+    5: 2.5705818356363146,
+    6: 2.4469118511449786,
+    7: 2.364624251592784,
+    8: 2.306004135204166,
+    9: 2.262157162798205,
+    10: 2.228138851986274,
+}
+
+
+def t_crit(alpha, df):
+    if alpha == 0.05 and df in _T_PPF_95:
+        return _T_PPF_95[df]
+    from scipy.stats import t
+    return float(t.ppf(1 - alpha / 2, df=df))
+
+
 def mean_ci(vals, alpha=0.05):
-    vals = np.array(vals, dtype=float)
-    n = len(vals)
-    m = float(vals.mean())
+    # 1-D samples, or a (runs x metrics) matrix summarized column by column
+    vals = np.asarray(vals, dtype=float)
+    n = vals.shape[0]
+    m = vals.mean(axis=0)
     if n < 2:
         return m, (m, m)
-    s = float(vals.std(ddof=1))
-    tcrit = float(t.ppf(1 - alpha / 2, df=n - 1))
+    s = vals.std(axis=0, ddof=1)
+    tcrit = t_crit(alpha, n - 1)
     half = tcrit * s / math.sqrt(n)
     return m, (m - half, m + half)
 
 
-# ---------- Time-average tracker for L and Lq ----------
-class AreaTracker:
-    def __init__(self):
-        self.N = 0      # number in system
-        self.Nq = 0     # number in queue (waiting, not in service)
-        self.last_t = 0.0
-        self.areaN = 0.0
-        self.areaNq = 0.0
-
-    def update(self, t):
-        dt = t - self.last_t
-        if dt > 0:
-            self.areaN += self.N * dt
-            self.areaNq += self.Nq * dt
-            self.last_t = t
-
-
-# ---------- Customer process ----------
-def customer(env, server, mu, tracker, stats, rng, Tsim):
-    arrival = env.now
-
-    # request server
-    with server.request() as req:
-        yield req
-        service_start = env.now
-
-        # if customer had been counted as queued, remove them from queue now
-        wait = service_start - arrival
-        if wait > 0:
-            tracker.update(env.now)
-            tracker.Nq -= 1
-
-        # service
-        service_time = rng.exponential(1.0 / mu)
-        # busy time clipped to [0, Tsim]
-        bs = max(0.0, service_start)
-        be = min(Tsim, service_start + service_time)
-        if be > bs:
-            stats["busy_time"] += (be - bs)
-
-        yield env.timeout(service_time)
-        depart = env.now
-
-        # only record times if completion happens within Tsim
-        if depart <= Tsim:
-            stats["waits"].append(wait)                 # Wq samples
-            stats["system_times"].append(depart - arrival)  # W samples
-
-    # departure updates N (only when the departure event occurs; env runs to Tsim)
-    tracker.update(env.now)
-    tracker.N -= 1
-
-
-# ---------- Arrival process ----------
-def arrivals(env, server, lmbda, mu, tracker, stats, rng, Tsim):
-    while True:
-        ia = rng.exponential(1.0 / lmbda)
-        yield env.timeout(ia)
-        if env.now > Tsim:
-            break
-
-        # arrival updates N
-        tracker.update(env.now)
-        tracker.N += 1
-
-        # if server is currently busy, this arrival will wait => count into queue
-        if server.count >= server.capacity:
-            tracker.Nq += 1
-
-        env.process(customer(env, server, mu, tracker, stats, rng, Tsim))
-
-
-# ---------- One SimPy replication ----------
-def simulate_mm1_simpy(lmbda, mu, Tsim, seed):
-    rng = np.random.default_rng(seed)
-    env = simpy.Environment()
-    server = simpy.Resource(env, capacity=1)
-
-    tracker = AreaTracker()
-    stats = {"waits": [], "system_times": [], "busy_time": 0.0}
-
-    env.process(arrivals(env, server, lmbda, mu, tracker, stats, rng, Tsim))
-    env.run(until=Tsim)
-
-    # finalize areas up to Tsim
-    tracker.update(Tsim)
-
-    # metrics
-    rho_sim = stats["busy_time"] / Tsim
-    L_sim = tracker.areaN / Tsim
-    Lq_sim = tracker.areaNq / Tsim
-
-    # averages from completed customers (by Tsim)
-    Wq_sim = float(np.mean(stats["waits"])) if stats["waits"] else float("nan")
-    W_sim = float(np.mean(stats["system_times"])) if stats["system_times"] else float("nan")
-
-    return {"rho": rho_sim, "Wq": Wq_sim, "W": W_sim, "Lq": Lq_sim, "L": L_sim}
+# ---------- One replication (shared M/M/c core with c = 1) ----------
+def simulate_mm1_simpy(lmbda, mu, Tsim, seed, verbose=False):
+    return simulate_mmc(lmbda, mu, 1, Tsim, seed, verbose=verbose)
 
 
 # ---------- Run 5 reps + print Table 1 & Table 2 ----------
-def run_experiment(lmbda=0.9, mu=1.0, Tsim=10000):
-    seeds = [225, 657, 468, 746, 829]
+def run_experiment(lmbda=0.9, mu=1.0, Tsim=10000, n_reps=5, root_seed=12345):
+    # one SeedSequence, spawned into statistically independent per-replication streams
+    streams = np.random.SeedSequence(root_seed).spawn(n_reps)
 
     theory = mm1_theory(lmbda, mu)
-    print(f"Parameters: lambda={lmbda:.3f}, mu={mu:.3f}, Tsim={Tsim}, replications={len(seeds)}")
-    print(f"Seeds: {seeds}\n")
-
-    print("THEORETICAL (M/M/1):")
-    for k in ["rho", "W", "Wq", "L", "Lq"]:
-        print(f"{k:>3} = {theory[k]:.6f}")
-    print()
-
-    runs = []
-    print("SIMULATION RUNS:")
-    print("Run |   rho_sim |      Wq |       W |      Lq |       L")
-    print("-" * 58)
-    for i, sd in enumerate(seeds, start=1):
-        r = simulate_mm1_simpy(lmbda, mu, Tsim, seed=sd)
-        runs.append(r)
-        print(f"{i:>3} | {r['rho']:>9.6f} | {r['Wq']:>7.4f} | {r['W']:>7.4f} | {r['Lq']:>7.4f} | {r['L']:>7.4f}")
-    print()
-
-    print("SUMMARY (mean ± 95% CI):")
-    for k in ["rho", "Wq", "W", "Lq", "L"]:
-        vals = [r[k] for r in runs]
-        m, (lo, hi) = mean_ci(vals)
-        print(f"{k:>3} mean={m:.6f}   95% CI=[{lo:.6f}, {hi:.6f}]")
+
+    # a compiled replication takes well under a millisecond, far less than starting
+    # a worker process, so run them in one loop (reusing sim_core's buffers) and print afterwards
+    runs = [simulate_mm1_simpy(lmbda, mu, Tsim, seed=ss) for ss in streams]
+
+    # collect the report and write it in one go
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        print(f"Parameters: lambda={lmbda:.3f}, mu={mu:.3f}, Tsim={Tsim}, replications={n_reps}")
+        print(f"Root seed: {root_seed}\n")
+
+        print("THEORETICAL (M/M/1):")
+        for k in ["rho", "W", "Wq", "L", "Lq"]:
+            print(f"{k:>3} = {theory[k]:.6f}")
+        print()
+
+        print("SIMULATION RUNS:")
+        print("Run |   rho_sim |      Wq |       W |      Lq |       L")
+        print("-" * 58)
+        for i, r in enumerate(runs, start=1):
+            print(f"{i:>3} | {r['rho']:>9.6f} | {r['Wq']:>7.4f} | {r['W']:>7.4f} | {r['Lq']:>7.4f} | {r['L']:>7.4f}")
+        print()
+
+        # one (runs x metrics) matrix, summarized in a single mean_ci call
+        keys = ["rho", "Wq", "W", "Lq", "L"]
+        M = np.array([[r[k] for k in keys] for r in runs])
+        means, (los, his) = mean_ci(M)
+
+        print("SUMMARY (mean ± 95% CI):")
+        for k, m, lo, hi in zip(keys, means, los, his):
+            print(f"{k:>3} mean={m:.6f}   95% CI=[{lo:.6f}, {hi:.6f}]")
+    sys.stdout.write(buf.getvalue())
 
     return theory, runs
 
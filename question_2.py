@@ -1,5 +1,10 @@
+import contextlib
+import io
+import sys
+
 import numpy as np
-import simpy
+
+import sim_core
 
 # ==========================
 # PARAMETERS (EDIT HERE)
@@ -7,105 +12,25 @@ import simpy
 LAMBDA = 1.8
 MU = 1.0
 TSIM = 10000                 # assume 10000 since not given
-SEEDS = [225]   # 5 runs (change to [235] for 1 run)
+ROOT_SEED = 12345            # every run draws from its own stream spawned from this seed
+N_RUNS = 1                   # runs per system (e.g. 5)
 
 SERVER_COST_PER_HR = 50.0
 WAIT_COST_PER_HR = 10.0
-# ==========================
-
-
-# ---------- Time-average tracker for N (system) and Nq (queue) ----------
-class AreaTracker:
-    def __init__(self):
-        self.N = 0       # number in system
-        self.Nq = 0      # number waiting in queue
-        self.last_t = 0.0
-        self.areaN = 0.0
-        self.areaNq = 0.0
-
-    def update(self, t):
-        dt = t - self.last_t
-        if dt > 0:
-            self.areaN += self.N * dt
-            self.areaNq += self.Nq * dt
-            self.last_t = t
-
-
-# ---------- Customer process ----------
-def customer(env, server, mu, tracker, stats, rng, Tsim):
-    arrival = env.now
-
-    with server.request() as req:
-        yield req
-        service_start = env.now
-
-        wait = service_start - arrival
-        if wait > 0:
-            tracker.update(env.now)
-            tracker.Nq -= 1
-
-        service_time = rng.exponential(1.0 / mu)
-
-        # accumulate total busy time across ALL servers
-        busy_start = max(0.0, service_start)
-        busy_end = min(Tsim, service_start + service_time)
-        if busy_end > busy_start:
-            stats["busy_time_total"] += (busy_end - busy_start)
-
-        yield env.timeout(service_time)
-
-        # record waiting time sample (for average Wq)
-        if env.now <= Tsim:
-            stats["waits"].append(wait)
-
-    # departure: customer leaves the system
-    tracker.update(env.now)
-    tracker.N -= 1
 
+RESULTS_FILE = "results.npz"  # per-c averages, read by plot_wq_vs_servers.py
+# ==========================
 
-# ---------- Arrival process ----------
-def arrivals(env, server, lmbda, mu, tracker, stats, rng, Tsim):
-    while True:
-        inter_arrival = rng.exponential(1.0 / lmbda)
-        yield env.timeout(inter_arrival)
-
-        if env.now > Tsim:
-            break
-
-        # arrival: customer enters system
-        tracker.update(env.now)
-        tracker.N += 1
-
-        # if all servers are busy, customer joins queue
-        if server.count >= server.capacity:
-            tracker.Nq += 1
 
-        env.process(customer(env, server, mu, tracker, stats, rng, Tsim))
+# ---------- Cost of running c servers ----------
+def add_cost(r, c):
+    r["cost_hr"] = SERVER_COST_PER_HR * c + WAIT_COST_PER_HR * r["Lq"]
+    return r
 
 
 # ---------- One simulation run for M/M/c ----------
-def simulate_mmc(lmbda, mu, c, Tsim, seed):
-    rng = np.random.default_rng(seed)
-    env = simpy.Environment()
-    server = simpy.Resource(env, capacity=c)
-
-    tracker = AreaTracker()
-    stats = {"waits": [], "busy_time_total": 0.0}
-
-    env.process(arrivals(env, server, lmbda, mu, tracker, stats, rng, Tsim))
-    env.run(until=Tsim)
-
-    # finalize areas up to Tsim
-    tracker.update(Tsim)
-
-    # metrics you need
-    rho = stats["busy_time_total"] / (c * Tsim)            # utilization
-    Wq = float(np.mean(stats["waits"])) if stats["waits"] else float("nan")
-    Lq = tracker.areaNq / Tsim                             # time-average queue length
-
-    cost_hr = SERVER_COST_PER_HR * c + WAIT_COST_PER_HR * Lq
-
-    return {"rho": rho, "Wq": Wq, "Lq": Lq, "cost_hr": cost_hr}
+def simulate_mmc(lmbda, mu, c, Tsim, seed, verbose=False):
+    return add_cost(sim_core.simulate_mmc(lmbda, mu, c, Tsim, seed, verbose=verbose), c)
 
 
 # ---------- Printing helpers (tables) ----------
@@ -117,11 +42,9 @@ def print_server_table(c, runs):
     for i, r in enumerate(runs, start=1):
         print(f"{i:>3} | {r['rho']:>18.6f} | {r['Wq']:>23.6f} | {r['Lq']:>20.6f} | ${r['cost_hr']:>11.2f}")
 
-    # averages (means)
-    rho_mean = float(np.mean([r["rho"] for r in runs]))
-    Wq_mean  = float(np.mean([r["Wq"] for r in runs]))
-    Lq_mean  = float(np.mean([r["Lq"] for r in runs]))
-    cost_mean = float(np.mean([r["cost_hr"] for r in runs]))
+    # averages (means) of one (runs x metrics) matrix
+    M = np.array([[r["rho"], r["Wq"], r["Lq"], r["cost_hr"]] for r in runs])
+    rho_mean, Wq_mean, Lq_mean, cost_mean = (float(x) for x in M.mean(axis=0))
 
     print("-" * 92)
     print(f"AVG | {rho_mean:>18.6f} | {Wq_mean:>23.6f} | {Lq_mean:>20.6f} | ${cost_mean:>11.2f}")
@@ -145,16 +68,36 @@ def print_comparison_table(summaries):
 
 
 def main():
-    print(f"Parameters: lambda={LAMBDA}, mu={MU}, Tsim={TSIM}, runs per system={len(SEEDS)}")
-    print(f"Cost model: server cost = ${SERVER_COST_PER_HR}/hr per server, waiting cost = ${WAIT_COST_PER_HR}/hr per waiting customer")
-
-    summaries = {}
-
-    for c in [1, 2, 3]:
-        runs = [simulate_mmc(LAMBDA, MU, c, TSIM, seed) for seed in SEEDS]
-        summaries[c] = print_server_table(c, runs)
-
-    print_comparison_table(summaries)
+    # independent streams per run; run i reuses the same stream for every c
+    streams = np.random.SeedSequence(ROOT_SEED).spawn(N_RUNS)
+
+    # all (c, run) pairs are scheduled together across threads
+    runs = sim_core.simulate_mmc_batch(LAMBDA, MU, [1, 2, 3], TSIM, streams)
+
+    # collect the report and write it in one go
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        print(f"Parameters: lambda={LAMBDA}, mu={MU}, Tsim={TSIM}, runs per system={N_RUNS}, root seed={ROOT_SEED}")
+        print(f"Cost model: server cost = ${SERVER_COST_PER_HR}/hr per server, waiting cost = ${WAIT_COST_PER_HR}/hr per waiting customer")
+
+        summaries = {}
+
+        for c in [1, 2, 3]:
+            summaries[c] = print_server_table(c, [add_cost(r, c) for r in runs[c]])
+
+        print_comparison_table(summaries)
+    sys.stdout.write(buf.getvalue())
+
+    # save the averages so the plot can be redrawn without re-running the simulation
+    cs = [1, 2, 3]
+    np.savez(
+        RESULTS_FILE,
+        c=np.array(cs),
+        rho=np.array([summaries[c]["rho_mean"] for c in cs]),
+        Wq=np.array([summaries[c]["Wq_mean"] for c in cs]),
+        Lq=np.array([summaries[c]["Lq_mean"] for c in cs]),
+        cost=np.array([summaries[c]["cost_mean"] for c in cs]),
+    )
 
 
 if __name__ == "__main__":
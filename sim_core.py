@@ -0,0 +1,171 @@
+import math
+import threading
+
+import numba
+import numpy as np
+
+
+# ---------- Inverse-CDF exponential draws ----------
+def exponential(rng, rate, n, out=None):
+    # X = -log(1 - U) / rate, computed in place on one uniform block (or into `out`)
+    u = rng.random(n) if out is None else rng.random(out=out)
+    np.negative(u, out=u)
+    np.log1p(u, out=u)
+    u *= -1.0 / rate
+    return u
+
+
+# ---------- Exponential samples for one run ----------
+def expected_customers(lmbda, Tsim):
+    # expected arrivals plus an 8-sigma margin: one batch almost always covers [0, Tsim]
+    return int(lmbda * Tsim + 8 * math.sqrt(lmbda * Tsim)) + 1
+
+
+def sample_customers(lmbda, mu, Tsim, rng, arrival_buf=None, service_buf=None):
+    n_hat = expected_customers(lmbda, Tsim)
+    arrival = np.cumsum(exponential(rng, lmbda, n_hat, out=arrival_buf), out=arrival_buf)
+    while arrival[-1] <= Tsim:
+        # ran short: double the buffer and sample the missing tail
+        tail = arrival[-1] + np.cumsum(exponential(rng, lmbda, len(arrival)))
+        arrival = np.concatenate([arrival, tail])
+
+    # keep only customers who arrive by Tsim, one service time each
+    k = int(np.searchsorted(arrival, Tsim, side="right"))
+    out = service_buf[:k] if service_buf is not None and k <= len(service_buf) else None
+    service = exponential(rng, mu, k, out=out)
+    return arrival[:k], service
+
+
+# ---------- Per-thread pool of scratch arrays, reused across runs ----------
+# (pays off for back-to-back simulate_mmc calls in one thread, e.g. run_experiment's loop)
+class BufferPool(threading.local):
+    def __init__(self):
+        self.free = {}   # length -> list of spare float64 arrays
+
+    def get(self, n):
+        bufs = self.free.get(n)
+        return bufs.pop() if bufs else np.empty(n)
+
+    def put(self, *bufs):
+        for buf in bufs:
+            self.free.setdefault(len(buf), []).append(buf)
+
+
+_POOL = BufferPool()
+
+
+# ---------- FCFS kernels (nopython JIT; samples are drawn by NumPy beforehand) ----------
+@numba.njit("void(float64[::1], float64[::1], float64[::1])", cache=True, fastmath=True)
+def _lindley_mm1_jit(arrival, service, out_start):
+    # FCFS single server: service starts at max(arrival, previous departure)
+    prev = 0.0
+    for i in range(arrival.shape[0]):
+        start_i = arrival[i] if arrival[i] > prev else prev
+        prev = start_i + service[i]
+        out_start[i] = start_i
+
+
+@numba.njit("void(float64[::1], float64[::1], float64[::1], float64[::1])", cache=True, fastmath=True)
+def _mmc_schedule_jit(arrival, service, free_at, out_start):
+    c = free_at.shape[0]
+    for i in range(arrival.shape[0]):
+        # linear scan for the server that frees up first (c is tiny)
+        j = 0
+        for k in range(1, c):
+            if free_at[k] < free_at[j]:
+                j = k
+        start_i = arrival[i] if arrival[i] > free_at[j] else free_at[j]
+        free_at[j] = start_i + service[i]
+        out_start[i] = start_i
+
+
+_lindley_mm1 = _lindley_mm1_jit
+_mmc_schedule = _mmc_schedule_jit
+
+try:
+    # prefer the compiled Cython kernels when they have been built (cythonize -i _lindley.pyx)
+    from _lindley import lindley_mm1 as _lindley_mm1
+    from _lindley import mmc_schedule as _mmc_schedule
+except ImportError:
+    pass
+
+
+# ---------- Every (c, run) schedule in one parallel kernel ----------
+@numba.njit(parallel=True, cache=True)
+def _mmc_schedule_batch(arrival, service, offsets, cs, out_start):
+    # run r owns arrival/service[offsets[r]:offsets[r + 1]]; row ci of out_start holds c = cs[ci]
+    n_runs = offsets.shape[0] - 1
+    for job in numba.prange(cs.shape[0] * n_runs):
+        ci = job // n_runs
+        r = job % n_runs
+        lo = offsets[r]
+        hi = offsets[r + 1]
+        _mmc_schedule_jit(arrival[lo:hi], service[lo:hi], np.zeros(cs[ci]), out_start[ci, lo:hi])
+
+
+# ---------- Metrics for one scheduled run ----------
+def mmc_metrics(arrival, service, start, c, Tsim):
+    depart = start + service
+
+    # Time averages over [0, Tsim]. The area under #{i : enter[i] <= t < leave[i]}
+    # is sum(min(leave, Tsim) - min(enter, Tsim)), the same integral as sorting the
+    # merged +1/-1 events. Every arrival is <= Tsim, so three clipped sums give
+    # busy time, customers in system and customers in queue in one pass each.
+    sum_a = float(np.sum(arrival))
+    sum_s = float(np.minimum(start, Tsim).sum())
+    sum_d = float(np.minimum(depart, Tsim).sum())
+    rho = (sum_d - sum_s) / (c * Tsim)    # utilization
+    L = (sum_d - sum_a) / Tsim            # in system
+    Lq = (sum_s - sum_a) / Tsim           # waiting in queue
+
+    # averages from customers completed by Tsim (any order when c > 1)
+    done = depart <= Tsim
+    has_done = bool(done.any())
+    Wq = float(np.mean(start - arrival, where=done)) if has_done else float("nan")
+    W = float(np.mean(depart - arrival, where=done)) if has_done else float("nan")
+
+    return {"rho": rho, "Wq": Wq, "W": W, "Lq": Lq, "L": L}
+
+
+# ---------- One simulation run for M/M/c ----------
+def simulate_mmc(lmbda, mu, c, Tsim, seed, verbose=False):
+    # verbose=True prints a one-line summary (off by default so batch output stays in one report)
+    rng = np.random.default_rng(seed)
+    n_hat = expected_customers(lmbda, Tsim)
+    bufs = (_POOL.get(n_hat), _POOL.get(n_hat), _POOL.get(n_hat))
+    arrival, service = sample_customers(lmbda, mu, Tsim, rng, bufs[0], bufs[1])
+    start = bufs[2][:len(arrival)] if len(arrival) <= n_hat else np.empty_like(arrival)
+
+    if c == 1:
+        # Lindley recursion: service starts at max(arrival, previous departure)
+        _lindley_mm1(arrival, service, start)
+    else:
+        # FCFS: each customer takes the server that frees up first
+        _mmc_schedule(arrival, service, np.zeros(c), start)
+
+    result = mmc_metrics(arrival, service, start, c, Tsim)
+    _POOL.put(*bufs)
+    if verbose:
+        print(f"M/M/{c}: {len(arrival)} arrivals, rho={result['rho']:.6f}, Wq={result['Wq']:.6f}, Lq={result['Lq']:.6f}")
+    return result
+
+
+# ---------- All systems x all runs in one batch ----------
+def simulate_mmc_batch(lmbda, mu, cs, Tsim, seeds):
+    # sample each run once (shared by every c), packed back to back
+    samples = [sample_customers(lmbda, mu, Tsim, np.random.default_rng(sd)) for sd in seeds]
+    offsets = np.zeros(len(samples) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(a) for a, _ in samples])
+    arrival = np.concatenate([a for a, _ in samples])
+    service = np.concatenate([s for _, s in samples])
+
+    start = np.empty((len(cs), len(arrival)))
+    _mmc_schedule_batch(arrival, service, offsets, np.asarray(cs, dtype=np.int64), start)
+
+    runs = {}
+    for ci, c in enumerate(cs):
+        runs[c] = [
+            mmc_metrics(arrival[lo:hi], service[lo:hi], start[ci, lo:hi], c, Tsim)
+            for lo, hi in zip(offsets[:-1], offsets[1:])
+        ]
+    return runs